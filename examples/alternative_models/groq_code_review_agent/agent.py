@@ -7,37 +7,104 @@ using Groq's fast inference capabilities with web search for best practices.
 
 from __future__ import annotations
 
-from typing import Optional, List
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Dict, Optional, List, Tuple
 
+from ddgs import DDGS
+from ddgs.exceptions import RatelimitException
 from upsonic import Agent
 from upsonic.tools.common_tools.duckduckgo import duckduckgo_search_tool
 
 
-def create_code_review_agent(
-    model: str = "groq/llama-3.3-70b-versatile",
-    tools: Optional[List] = None,
-) -> Agent:
-    """Create the code review agent with Groq model.
+SEARCH_CACHE_TTL = 24 * 60 * 60
+# Expired results are kept this long as a fallback for failed live queries
+STALE_SEARCH_TTL = 7 * 24 * 60 * 60
+# Bounds memory in the long-running API server
+MAX_CACHED_SEARCHES = 1000
+MIN_SEARCH_INTERVAL = 3.0
+# ddgs 9.x engine retried once when the default ("auto") backend is rate-limited
+FALLBACK_BACKEND = "duckduckgo"
+
+
+class CachedDDGS:
+    """DDGS client that caches results and spaces out live queries.
     
-    Args:
-        model: Groq model identifier for the agent
-        tools: Optional list of additional tools
-        
-    Returns:
-        Configured Agent instance for code review
+    DuckDuckGo rate-limits bursts of queries, and reviews often repeat the
+    same searches. Results are kept for SEARCH_CACHE_TTL seconds and live
+    queries are at least MIN_SEARCH_INTERVAL seconds apart. A rate-limited
+    query is retried once on FALLBACK_BACKEND, and a failed live query falls
+    back to a stale cached result when one exists. Results older than
+    STALE_SEARCH_TTL are dropped, and at most MAX_CACHED_SEARCHES are kept.
     """
-    ddg_search = duckduckgo_search_tool(duckduckgo_client=None, max_results=5)
     
-    agent_tools = [ddg_search]
-    if tools:
-        agent_tools.extend(tools)
+    def __init__(self, client: Optional[DDGS] = None):
+        self._client = client or DDGS()
+        self._cache: OrderedDict[Any, Tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_request = 0.0
     
-    agent = Agent(
-        model=model,
-        name="code-review-agent",
-        role="Senior Software Engineer & Code Reviewer",
-        goal="Provide comprehensive code reviews with actionable feedback on security, performance, best practices, and code quality",
-        system_prompt="""You are an expert senior software engineer with 15+ years of experience 
+    def text(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        key = (query, args, tuple(sorted(kwargs.items())))
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+            return cached[1]
+        
+        with self._lock:
+            # Another thread may have fetched the same query while this one waited
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < SEARCH_CACHE_TTL:
+                return cached[1]
+            
+            try:
+                results = self._live_text(query, *args, **kwargs)
+            except RatelimitException:
+                if "backend" in kwargs:
+                    results = None
+                else:
+                    try:
+                        results = self._live_text(query, *args, backend=FALLBACK_BACKEND, **kwargs)
+                    except Exception:
+                        results = None
+                if results is None:
+                    if cached is not None:
+                        return cached[1]
+                    raise
+            except Exception:
+                if cached is not None:
+                    return cached[1]
+                raise
+            
+            self._cache.pop(key, None)
+            self._cache[key] = (time.monotonic(), results)
+            self._evict()
+        return results
+    
+    def _evict(self) -> None:
+        """Drop results past STALE_SEARCH_TTL, then the oldest beyond MAX_CACHED_SEARCHES. Call with the lock held."""
+        cutoff = time.monotonic() - STALE_SEARCH_TTL
+        for key in [key for key, (fetched_at, _) in self._cache.items() if fetched_at < cutoff]:
+            del self._cache[key]
+        while len(self._cache) > MAX_CACHED_SEARCHES:
+            self._cache.popitem(last=False)
+    
+    def _live_text(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        """Run a live query, spaced MIN_SEARCH_INTERVAL after the previous one. Call with the lock held."""
+        wait = self._last_request + MIN_SEARCH_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            return self._client.text(query, *args, **kwargs)
+        finally:
+            self._last_request = time.monotonic()
+
+
+CODE_REVIEW_SYSTEM_PROMPT = """You are an expert senior software engineer with 15+ years of experience 
         in code review and software architecture. Your expertise spans multiple programming languages 
         and you have deep knowledge of:
         
@@ -73,7 +140,80 @@ def create_code_review_agent(
         - Example: "suggestion": "Use parameterized queries" (plain string, NOT "{ \\"fix\\": ... }")
         
         Be constructive and educational in your feedback. Help developers understand 
-        not just what to fix, but why.""",
+        not just what to fix, but why."""
+
+
+SECURITY_SYSTEM_PROMPT = """You are a security expert specializing in application security and 
+        secure coding practices. Your focus is on identifying:
+        
+        - SQL Injection vulnerabilities
+        - Cross-Site Scripting (XSS)
+        - Cross-Site Request Forgery (CSRF)
+        - Insecure Direct Object References
+        - Security Misconfiguration
+        - Sensitive Data Exposure
+        - Authentication/Authorization flaws
+        - Input validation issues
+        - Cryptographic weaknesses
+        - Race conditions and timing attacks
+        
+        For each vulnerability found:
+        1. Explain the attack vector
+        2. Demonstrate potential exploit scenarios
+        3. Provide secure code alternatives
+        4. Reference OWASP guidelines when applicable
+        
+        Use web search to find current CVEs and security advisories related to the 
+        libraries or patterns being used."""
+
+
+PERFORMANCE_SYSTEM_PROMPT = """You are a performance engineering specialist with expertise in:
+        
+        - Algorithmic complexity analysis (Big O notation)
+        - Memory management and optimization
+        - Database query optimization
+        - Caching strategies
+        - Concurrent programming and parallelism
+        - I/O optimization
+        - Profiling and benchmarking
+        
+        When analyzing code:
+        1. Identify inefficient algorithms or data structures
+        2. Spot memory leaks or excessive allocations
+        3. Find N+1 query problems and database issues
+        4. Suggest caching opportunities
+        5. Identify blocking operations that could be async
+        6. Recommend profiling strategies
+        
+        Use web search to find current benchmarks and performance best practices 
+        for the specific language and framework being used."""
+
+
+# Shared by every agent so the search client and its cache are built once per process
+ddg_search = duckduckgo_search_tool(duckduckgo_client=CachedDDGS(), max_results=5)
+
+
+def create_code_review_agent(
+    model: str = "groq/llama-3.3-70b-versatile",
+    tools: Optional[List] = None,
+) -> Agent:
+    """Create the code review agent with Groq model.
+    
+    Args:
+        model: Groq model identifier for the agent
+        tools: Optional list of additional tools
+        
+    Returns:
+        Configured Agent instance for code review
+    """
+    agent_tools = [ddg_search, *(tools or [])]
+    
+    agent = Agent(
+        model=model,
+        name="code-review-agent",
+        role="Senior Software Engineer & Code Reviewer",
+        goal="Provide comprehensive code reviews with actionable feedback on security, performance, best practices, and code quality",
+        system_prompt=CODE_REVIEW_SYSTEM_PROMPT,
         tools=agent_tools,
         tool_call_limit=10,
     )
@@ -92,35 +232,12 @@ def create_security_focused_agent(
     Returns:
         Configured Agent instance for security review
     """
-    ddg_search = duckduckgo_search_tool(duckduckgo_client=None, max_results=5)
-    
     return Agent(
         model=model,
         name="security-review-agent",
         role="Application Security Specialist",
         goal="Identify and report security vulnerabilities in code with remediation guidance",
-        system_prompt="""You are a security expert specializing in application security and 
-        secure coding practices. Your focus is on identifying:
-        
-        - SQL Injection vulnerabilities
-        - Cross-Site Scripting (XSS)
-        - Cross-Site Request Forgery (CSRF)
-        - Insecure Direct Object References
-        - Security Misconfiguration
-        - Sensitive Data Exposure
-        - Authentication/Authorization flaws
-        - Input validation issues
-        - Cryptographic weaknesses
-        - Race conditions and timing attacks
-        
-        For each vulnerability found:
-        1. Explain the attack vector
-        2. Demonstrate potential exploit scenarios
-        3. Provide secure code alternatives
-        4. Reference OWASP guidelines when applicable
-        
-        Use web search to find current CVEs and security advisories related to the 
-        libraries or patterns being used.""",
+        system_prompt=SECURITY_SYSTEM_PROMPT,
         tools=[ddg_search],
         tool_call_limit=8,
     )
@@ -137,34 +254,83 @@ def create_performance_focused_agent(
     Returns:
         Configured Agent instance for performance review
     """
-    ddg_search = duckduckgo_search_tool(duckduckgo_client=None, max_results=5)
-    
     return Agent(
         model=model,
         name="performance-review-agent",
         role="Performance Engineering Specialist",
         goal="Analyze code for performance bottlenecks and optimization opportunities",
-        system_prompt="""You are a performance engineering specialist with expertise in:
-        
-        - Algorithmic complexity analysis (Big O notation)
-        - Memory management and optimization
-        - Database query optimization
-        - Caching strategies
-        - Concurrent programming and parallelism
-        - I/O optimization
-        - Profiling and benchmarking
-        
-        When analyzing code:
-        1. Identify inefficient algorithms or data structures
-        2. Spot memory leaks or excessive allocations
-        3. Find N+1 query problems and database issues
-        4. Suggest caching opportunities
-        5. Identify blocking operations that could be async
-        6. Recommend profiling strategies
-        
-        Use web search to find current benchmarks and performance best practices 
-        for the specific language and framework being used.""",
+        system_prompt=PERFORMANCE_SYSTEM_PROMPT,
         tools=[ddg_search],
         tool_call_limit=8,
     )
 
+
+AGENT_FACTORIES: Dict[str, Callable[[str], Agent]] = {
+    "general": create_code_review_agent,
+    "security": create_security_focused_agent,
+    "performance": create_performance_focused_agent,
+}
+
+
+class AgentPool:
+    """Reusable agents of one kind and model, each lent to one review at a time.
+    
+    An upsonic Agent keeps its current run (output, run id, task, tool call
+    count) on the instance, so concurrent ``do_async`` calls on one agent can
+    swap their outputs. ``checkout`` hands out an idle agent, or builds a new
+    one in a worker thread when all are busy, and takes it back afterwards.
+    The pool therefore grows to the peak number of concurrent requests.
+    """
+    
+    def __init__(self, kind: str, model: str):
+        self.kind = kind
+        self.model = model
+        self._idle: List[Agent] = []
+    
+    async def _build(self) -> Agent:
+        return await asyncio.to_thread(AGENT_FACTORIES[self.kind], self.model)
+    
+    async def warm(self) -> None:
+        """Build one idle agent if there is none, so the first review skips the build."""
+        if not self._idle:
+            self._idle.append(await self._build())
+    
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[Agent]:
+        agent = self._idle.pop() if self._idle else await self._build()
+        try:
+            yield agent
+        finally:
+            self._idle.append(agent)
+
+
+@lru_cache(maxsize=8)
+def agent_pool(kind: str, model: str) -> AgentPool:
+    """Return the shared pool of ``kind`` agents ("general", "security" or "performance") for a model."""
+    return AgentPool(kind, model)
+
+
+async def warm_agents(
+    model_general: str = "groq/llama-3.3-70b-versatile",
+    model_fast: str = "groq/llama-3.1-8b-instant",
+) -> Tuple[AgentPool, AgentPool, AgentPool]:
+    """Return the general, security and performance agent pools, each with an agent built.
+    
+    The agents are built concurrently, and only when a pool has no idle
+    agent, so this only does real work the first time it is called for a
+    given pair of models.
+    
+    Args:
+        model_general: Groq model identifier for the general review agent
+        model_fast: Groq model identifier for the specialist agents
+        
+    Returns:
+        Tuple of (general, security, performance) agent pools
+    """
+    pools = (
+        agent_pool("general", model_general),
+        agent_pool("security", model_fast),
+        agent_pool("performance", model_fast),
+    )
+    await asyncio.gather(*(pool.warm() for pool in pools))
+    return pools
@@ -1,17 +1,221 @@
 from __future__ import annotations
 
-from typing import Dict, Any
+import asyncio
+import bisect
+import hashlib
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional
 
 from upsonic import Task
 
 try:
-    from .agent import create_code_review_agent
-    from .task_builder import build_review_task
-    from .schemas import CodeReviewOutput
+    from .agent import (
+        AgentPool,
+        agent_pool,
+        warm_agents,
+    )
+    from .task_builder import build_review_task, build_batch_review_task, split_code
+    from .schemas import (
+        CodeReviewOutput,
+        CodeReviewBatchOutput,
+        SecurityAnalysis,
+        PerformanceAnalysis,
+        CodeQualityMetrics,
+        dump_review,
+        load_review,
+    )
 except ImportError:
-    from agent import create_code_review_agent
-    from task_builder import build_review_task
-    from schemas import CodeReviewOutput
+    from agent import (
+        AgentPool,
+        agent_pool,
+        warm_agents,
+    )
+    from task_builder import build_review_task, build_batch_review_task, split_code
+    from schemas import (
+        CodeReviewOutput,
+        CodeReviewBatchOutput,
+        SecurityAnalysis,
+        PerformanceAnalysis,
+        CodeQualityMetrics,
+        dump_review,
+        load_review,
+    )
+
+
+# Focus areas that get a dedicated specialist agent running alongside the general review
+SPECIALIST_AREAS = ("security", "performance")
+
+RISK_LEVELS = ["none", "low", "medium", "high", "critical"]
+OVERALL_RATINGS = ["excellent", "good", "needs_improvement", "poor", "critical"]
+QUALITY_SCORES = ["excellent", "good", "fair", "poor", "missing"]
+
+EXCERPT_NOTE = (
+    "This code is an excerpt of a larger file; names it uses may be defined "
+    "in other parts of the file."
+)
+
+# Batched snippets are grouped by code size (<1KB, 1-4KB, >4KB) so one long
+# snippet does not dominate a request full of short ones
+BATCH_SIZE_BINS = (1_000, 4_000)
+MAX_BATCH_SIZE = 5
+# Total code per batched request is capped too, so large snippets are not
+# packed into one oversized prompt
+MAX_BATCH_CHARS = 8_000
+
+# Every Groq request (general, specialist, chunk, fallback and batch reviews)
+# goes through this semaphore, so concurrent main() calls that each fan out
+# to several requests together stay under Groq's rate limits
+MAX_CONCURRENT_REQUESTS = 8
+_REQUEST_SEMAPHORE = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+REVIEW_CACHE_DIR = Path(os.getenv("CODE_REVIEW_CACHE_DIR", "~/.cache/upsonic_review")).expanduser()
+
+SEVERITY_ICONS = MappingProxyType({
+    "critical": "🔴",
+    "high": "🟠",
+    "medium": "🟡",
+    "low": "🟢",
+    "info": "🔵",
+})
+
+
+def _review_cache_key(
+    code: str,
+    language: str,
+    focus_areas: List[str],
+    context: Optional[str],
+    model: str,
+    mode: str = "full",
+) -> str:
+    # main_batch produces general-only reviews, so its entries live under a
+    # separate mode and are never served to main() as a full review
+    raw = f"{mode}|{model}|{language}|{','.join(focus_areas)}|{context or ''}|{code}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _load_cached_review(key: str) -> Optional[CodeReviewOutput]:
+    try:
+        return load_review((REVIEW_CACHE_DIR / f"{key}.json").read_bytes())
+    except (OSError, ValueError):
+        return None
+
+
+def _store_review(key: str, report: CodeReviewOutput) -> None:
+    # A read-only or HOME-less container must not lose a finished review
+    try:
+        REVIEW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (REVIEW_CACHE_DIR / f"{key}.json").write_bytes(dump_review(report))
+    except OSError as e:
+        print(f"⚠️ Could not cache review: {e}")
+
+
+async def _run_task(pool: AgentPool, task: Task) -> Any:
+    # Each in-flight request runs on its own agent from the pool, so at most
+    # MAX_CONCURRENT_REQUESTS agents per pool are ever built
+    async with _REQUEST_SEMAPHORE:
+        async with pool.checkout() as agent:
+            return await agent.do_async(task)
+
+
+def _unique(items: List[str]) -> List[str]:
+    return list(dict.fromkeys(items))
+
+
+def _label_chunk(report: CodeReviewOutput, label: str) -> CodeReviewOutput:
+    """Prefix a chunk review's summary and issue locations with the chunk's line range."""
+    issues = [
+        issue.model_copy(update={
+            "line_reference": f"{label}: {issue.line_reference}" if issue.line_reference else label
+        })
+        for issue in report.issues
+    ]
+    return report.model_copy(update={"summary": f"[{label}] {report.summary}", "issues": issues})
+
+
+def _merge_reviews(
+    primary: CodeReviewOutput,
+    others: List[CodeReviewOutput],
+    same_code: bool = True,
+) -> CodeReviewOutput:
+    """Fold specialist reviews into the general review, or chunk reviews together.
+
+    Issues are concatenated (skipping duplicates by title and location), the
+    highest security risk level and the worst code quality score per metric
+    win, and list fields are unioned in order. Reviews of the same code
+    (``same_code``) report the same vulnerabilities, so the largest count
+    wins; reviews of different chunks report different ones, so counts add up.
+    """
+    if not others:
+        return primary
+    
+    issues = list(primary.issues)
+    seen = {(issue.title.strip().lower(), issue.line_reference) for issue in issues}
+    security = primary.security_analysis
+    performance = primary.performance_analysis
+    quality = primary.code_quality
+    priority_fixes = list(primary.priority_fixes)
+    learning_resources = list(primary.learning_resources)
+    positive_aspects = list(primary.positive_aspects)
+    
+    for other in others:
+        for issue in other.issues:
+            key = (issue.title.strip().lower(), issue.line_reference)
+            if key not in seen:
+                seen.add(key)
+                issues.append(issue)
+        
+        other_security = other.security_analysis
+        security = SecurityAnalysis(
+            vulnerabilities_found=(
+                max(security.vulnerabilities_found, other_security.vulnerabilities_found)
+                if same_code
+                else security.vulnerabilities_found + other_security.vulnerabilities_found
+            ),
+            risk_level=max(security.risk_level, other_security.risk_level, key=RISK_LEVELS.index),
+            owasp_categories=_unique(security.owasp_categories + other_security.owasp_categories),
+            recommendations=_unique(security.recommendations + other_security.recommendations),
+        )
+        
+        other_performance = other.performance_analysis
+        performance = PerformanceAnalysis(
+            complexity_issues=_unique(performance.complexity_issues + other_performance.complexity_issues),
+            memory_concerns=_unique(performance.memory_concerns + other_performance.memory_concerns),
+            optimization_opportunities=_unique(
+                performance.optimization_opportunities + other_performance.optimization_opportunities
+            ),
+        )
+        
+        other_quality = other.code_quality
+        quality = CodeQualityMetrics(
+            readability_score=max(
+                quality.readability_score, other_quality.readability_score, key=QUALITY_SCORES.index
+            ),
+            maintainability_score=max(
+                quality.maintainability_score, other_quality.maintainability_score, key=QUALITY_SCORES.index
+            ),
+            test_coverage_suggestion=" ".join(
+                _unique([quality.test_coverage_suggestion, other_quality.test_coverage_suggestion])
+            ),
+            documentation_quality=max(
+                quality.documentation_quality, other_quality.documentation_quality, key=QUALITY_SCORES.index
+            ),
+        )
+        
+        priority_fixes.extend(other.priority_fixes)
+        learning_resources.extend(other.learning_resources)
+        positive_aspects.extend(other.positive_aspects)
+    
+    return primary.model_copy(update={
+        "issues": issues,
+        "security_analysis": security,
+        "performance_analysis": performance,
+        "code_quality": quality,
+        "priority_fixes": _unique(priority_fixes),
+        "learning_resources": _unique(learning_resources),
+        "positive_aspects": _unique(positive_aspects),
+    })
 
 
 async def main(inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -25,6 +229,9 @@ async def main(inputs: Dict[str, Any]) -> Dict[str, Any]:
             - focus_areas: Optional list of areas to focus on (security, performance, etc.)
             - context: Optional context about the codebase or project
             - model: Optional model identifier (default: "groq/llama-3.3-70b-versatile")
+            - use_cache: Whether to reuse a stored review of identical inputs (default: True)
+            - fallback_model: Optional model to retry the general review with when
+              the primary model fails, e.g. when Groq rate-limits the request
     
     Returns:
         Dictionary containing comprehensive code review
@@ -40,19 +247,90 @@ async def main(inputs: Dict[str, Any]) -> Dict[str, Any]:
     focus_areas = inputs.get("focus_areas", [])
     context = inputs.get("context")
     model = inputs.get("model", "groq/llama-3.3-70b-versatile")
+    use_cache = inputs.get("use_cache", True)
+    fallback_model = inputs.get("fallback_model")
+    
+    cache_key = _review_cache_key(code, language, focus_areas, context, model)
+    if use_cache:
+        cached_report = _load_cached_review(cache_key)
+        if cached_report is not None:
+            return {
+                "language": language,
+                "focus_areas": focus_areas,
+                "review_report": cached_report,
+                "review_completed": True,
+            }
+    
+    general_pool, security_pool, performance_pool = await warm_agents(model_general=model)
+    specialists = {"security": security_pool, "performance": performance_pool}
     
-    agent = create_code_review_agent(model=model)
+    # Long Python files are reviewed in chunks of whole top-level definitions,
+    # so each request carries a smaller prompt and the chunks run in parallel
+    chunks = split_code(code, language)
+    review_context = context
+    if len(chunks) > 1:
+        review_context = f"{context}\n    {EXCERPT_NOTE}" if context else EXCERPT_NOTE
     
-    task_description = build_review_task(
-        code=code,
-        language=language,
-        focus_areas=focus_areas,
-        context=context,
+    # (agent pool, task description, is general review, chunk index, chunk label)
+    reviews = []
+    for chunk_index, (first_line, last_line, chunk) in enumerate(chunks):
+        label = f"lines {first_line}-{last_line}" if len(chunks) > 1 else None
+        reviews.append(
+            (general_pool, build_review_task(chunk, language, focus_areas, review_context), True, chunk_index, label)
+        )
+        
+        # Security and performance reviews are independent LLM calls, so they
+        # run concurrently with the general review instead of after it
+        for area in focus_areas:
+            if area not in SPECIALIST_AREAS:
+                continue
+            specialist_description = build_review_task(chunk, language, [area], review_context)
+            reviews.append((specialists[area], specialist_description, False, chunk_index, label))
+    
+    results = await asyncio.gather(
+        *(
+            _run_task(reviewer, Task(description, response_format=CodeReviewOutput))
+            for reviewer, description, _, _, _ in reviews
+        ),
+        return_exceptions=True,
     )
     
-    task = Task(task_description, response_format=CodeReviewOutput)
+    general_reports: Dict[int, CodeReviewOutput] = {}
+    specialist_reports: Dict[int, List[CodeReviewOutput]] = {}
+    for (_, description, is_general, chunk_index, label), report in zip(reviews, results):
+        if isinstance(report, BaseException) and is_general and fallback_model:
+            print(f"⚠️ Review with {model} failed, retrying with {fallback_model}: {report}")
+            fallback_pool = agent_pool("general", fallback_model)
+            report = await _run_task(fallback_pool, Task(description, response_format=CodeReviewOutput))
+        if isinstance(report, BaseException):
+            if is_general:
+                raise report
+            print(f"⚠️ Specialist review failed, continuing without it: {report}")
+            continue
+        if label:
+            report = _label_chunk(report, label)
+        if is_general:
+            general_reports[chunk_index] = report
+        else:
+            specialist_reports.setdefault(chunk_index, []).append(report)
+    
+    # Specialists reviewed the same code as their chunk's general review;
+    # the merged chunk reviews then cover different code
+    chunk_reports = [
+        _merge_reviews(general_reports[index], specialist_reports.get(index, []))
+        for index in range(len(chunks))
+    ]
+    result = _merge_reviews(chunk_reports[0], chunk_reports[1:], same_code=False)
+    if len(chunk_reports) > 1:
+        result = result.model_copy(update={
+            "summary": "\n\n".join(report.summary for report in chunk_reports),
+            "overall_rating": max(
+                (report.overall_rating for report in chunk_reports), key=OVERALL_RATINGS.index
+            ),
+        })
     
-    result = await agent.do_async(task)
+    if use_cache:
+        _store_review(cache_key, result)
     
     return {
         "language": language,
@@ -62,12 +340,104 @@ async def main(inputs: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+async def main_batch(inputs_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Review several code snippets with as few Groq requests as possible.
+    
+    Snippets are grouped by model and code size, and each group of up to
+    MAX_BATCH_SIZE snippets (and MAX_BATCH_CHARS of code) is reviewed in a
+    single request. Groups run concurrently. Only the general review agent
+    is used; for the security/performance specialists and chunked reviews of
+    long files, call main() per snippet.
+    
+    Args:
+        inputs_list: List of input dictionaries, each accepted by main()
+    
+    Returns:
+        List of results in the same order and format as main() returns. If
+        a group fails, its snippets get ``review_completed: False`` and an
+        ``error`` message while the other groups' results are kept.
+    """
+    for inputs in inputs_list:
+        if not inputs.get("code"):
+            raise ValueError("code is required in inputs")
+        if not inputs.get("language"):
+            raise ValueError("language is required in inputs")
+    
+    reports: Dict[int, CodeReviewOutput] = {}
+    errors: Dict[int, str] = {}
+    cache_keys: Dict[int, str] = {}
+    bins: Dict[tuple, List[int]] = {}
+    
+    for index, inputs in enumerate(inputs_list):
+        model = inputs.get("model", "groq/llama-3.3-70b-versatile")
+        cache_keys[index] = _review_cache_key(
+            inputs["code"], inputs["language"], inputs.get("focus_areas", []), inputs.get("context"), model,
+            mode="batch",
+        )
+        if inputs.get("use_cache", True):
+            cached_report = _load_cached_review(cache_keys[index])
+            if cached_report is not None:
+                reports[index] = cached_report
+                continue
+        size_bin = bisect.bisect(BATCH_SIZE_BINS, len(inputs["code"]))
+        bins.setdefault((model, size_bin), []).append(index)
+    
+    groups = []
+    for (model, _), indexes in bins.items():
+        group: List[int] = []
+        group_chars = 0
+        for index in indexes:
+            size = len(inputs_list[index]["code"])
+            if group and (len(group) == MAX_BATCH_SIZE or group_chars + size > MAX_BATCH_CHARS):
+                groups.append((model, group))
+                group, group_chars = [], 0
+            group.append(index)
+            group_chars += size
+        groups.append((model, group))
+    
+    async def review_batch(model: str, indexes: List[int]) -> None:
+        task_description = build_batch_review_task([inputs_list[i] for i in indexes])
+        batch = await _run_task(agent_pool("general", model), Task(task_description, response_format=CodeReviewBatchOutput))
+        if len(batch.reviews) != len(indexes):
+            raise ValueError(f"Expected {len(indexes)} reviews in batch, got {len(batch.reviews)}")
+        for index, report in zip(indexes, batch.reviews):
+            reports[index] = report
+            if inputs_list[index].get("use_cache", True):
+                _store_review(cache_keys[index], report)
+    
+    results = await asyncio.gather(
+        *(review_batch(model, indexes) for model, indexes in groups),
+        return_exceptions=True,
+    )
+    for (_, indexes), outcome in zip(groups, results):
+        if isinstance(outcome, BaseException):
+            print(f"⚠️ Batch review of {len(indexes)} snippets failed: {outcome}")
+            for index in indexes:
+                errors[index] = str(outcome)
+    
+    return [
+        {
+            "language": inputs["language"],
+            "focus_areas": inputs.get("focus_areas", []),
+            "review_report": reports.get(index),
+            "review_completed": index in reports,
+            **({"error": errors[index]} if index in errors else {}),
+        }
+        for index, inputs in enumerate(inputs_list)
+    ]
+
+
 
 if __name__ == "__main__":
-    import asyncio
     import json
     import sys
     
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+    
     test_code = '''
 def calculate_discount(price, discount_percent):
     if discount_percent > 100:
@@ -102,116 +472,125 @@ class UserManager:
     
     if len(sys.argv) > 1:
         try:
-            with open(sys.argv[1], "r") as f:
-                test_inputs = json.load(f)
+            with open(sys.argv[1], "rb") as f:
+                raw_inputs = f.read()
+            test_inputs = orjson.loads(raw_inputs) if orjson else json.loads(raw_inputs)
         except Exception as e:
             print(f"Error loading JSON file: {e}")
             print("Using default test inputs")
     
-    async def run_main():
-        try:
-            result = await main(test_inputs)
-            report: CodeReviewOutput = result.get('review_report')
-            
-            print("\n" + "=" * 80)
-            print("🔍 CODE REVIEW COMPLETED SUCCESSFULLY")
-            print("=" * 80)
-            
-            print(f"\n📋 Language: {result.get('language')}")
-            print(f"🎯 Focus Areas: {', '.join(result.get('focus_areas', []))}")
-            print(f"⭐ Overall Rating: {report.overall_rating.upper()}")
-            
-            print("\n" + "-" * 80)
-            print("📝 SUMMARY")
-            print("-" * 80)
-            print(report.summary)
-            
-            print("\n" + "-" * 80)
-            print(f"🚨 ISSUES FOUND ({len(report.issues)})")
-            print("-" * 80)
-            for i, issue in enumerate(report.issues, 1):
-                severity_icons = {
-                    "critical": "🔴",
-                    "high": "🟠", 
-                    "medium": "🟡",
-                    "low": "🟢",
-                    "info": "🔵"
-                }
-                icon = severity_icons.get(issue.severity, "⚪")
-                print(f"\n{i}. {icon} [{issue.severity.upper()}] {issue.title}")
-                print(f"   Category: {issue.category}")
-                if issue.line_reference:
-                    print(f"   Location: {issue.line_reference}")
-                print(f"   Description: {issue.description}")
-                print(f"   Suggestion: {issue.suggestion}")
-                if issue.code_example:
-                    print(f"   Example: {issue.code_example}")
-            
-            print("\n" + "-" * 80)
-            print("🔒 SECURITY ANALYSIS")
-            print("-" * 80)
-            sec = report.security_analysis
-            print(f"   Risk Level: {sec.risk_level.upper()}")
-            print(f"   Vulnerabilities Found: {sec.vulnerabilities_found}")
-            if sec.owasp_categories:
-                print(f"   OWASP Categories: {', '.join(sec.owasp_categories)}")
-            if sec.recommendations:
-                print("   Recommendations:")
-                for rec in sec.recommendations:
-                    print(f"     • {rec}")
-            
-            print("\n" + "-" * 80)
-            print("⚡ PERFORMANCE ANALYSIS")
-            print("-" * 80)
-            perf = report.performance_analysis
-            if perf.complexity_issues:
-                print("   Complexity Issues:")
-                for issue in perf.complexity_issues:
-                    print(f"     • {issue}")
-            if perf.memory_concerns:
-                print("   Memory Concerns:")
-                for concern in perf.memory_concerns:
-                    print(f"     • {concern}")
-            if perf.optimization_opportunities:
-                print("   Optimization Opportunities:")
-                for opp in perf.optimization_opportunities:
-                    print(f"     • {opp}")
-            
+    # Severity icons only help on a terminal; redirected output (CI logs) gets plain labels
+    use_icons = sys.stdout.isatty()
+    
+    def print_review(result: Dict[str, Any]) -> None:
+        report: CodeReviewOutput = result.get('review_report')
+        
+        print("\n" + "=" * 80)
+        print("🔍 CODE REVIEW COMPLETED SUCCESSFULLY")
+        print("=" * 80)
+        
+        print(f"\n📋 Language: {result.get('language')}")
+        print(f"🎯 Focus Areas: {', '.join(result.get('focus_areas', []))}")
+        print(f"⭐ Overall Rating: {report.overall_rating.upper()}")
+        
+        print("\n" + "-" * 80)
+        print("📝 SUMMARY")
+        print("-" * 80)
+        print(report.summary)
+        
+        print("\n" + "-" * 80)
+        print(f"🚨 ISSUES FOUND ({len(report.issues)})")
+        print("-" * 80)
+        for i, issue in enumerate(report.issues, 1):
+            icon = f"{SEVERITY_ICONS.get(issue.severity, '⚪')} " if use_icons else ""
+            print(f"\n{i}. {icon}[{issue.severity.upper()}] {issue.title}")
+            print(f"   Category: {issue.category}")
+            if issue.line_reference:
+                print(f"   Location: {issue.line_reference}")
+            print(f"   Description: {issue.description}")
+            print(f"   Suggestion: {issue.suggestion}")
+            if issue.code_example:
+                print(f"   Example: {issue.code_example}")
+        
+        print("\n" + "-" * 80)
+        print("🔒 SECURITY ANALYSIS")
+        print("-" * 80)
+        sec = report.security_analysis
+        print(f"   Risk Level: {sec.risk_level.upper()}")
+        print(f"   Vulnerabilities Found: {sec.vulnerabilities_found}")
+        if sec.owasp_categories:
+            print(f"   OWASP Categories: {', '.join(sec.owasp_categories)}")
+        if sec.recommendations:
+            print("   Recommendations:")
+            for rec in sec.recommendations:
+                print(f"     • {rec}")
+        
+        print("\n" + "-" * 80)
+        print("⚡ PERFORMANCE ANALYSIS")
+        print("-" * 80)
+        perf = report.performance_analysis
+        if perf.complexity_issues:
+            print("   Complexity Issues:")
+            for issue in perf.complexity_issues:
+                print(f"     • {issue}")
+        if perf.memory_concerns:
+            print("   Memory Concerns:")
+            for concern in perf.memory_concerns:
+                print(f"     • {concern}")
+        if perf.optimization_opportunities:
+            print("   Optimization Opportunities:")
+            for opp in perf.optimization_opportunities:
+                print(f"     • {opp}")
+        
+        print("\n" + "-" * 80)
+        print("📊 CODE QUALITY METRICS")
+        print("-" * 80)
+        quality = report.code_quality
+        print(f"   Readability: {quality.readability_score}")
+        print(f"   Maintainability: {quality.maintainability_score}")
+        print(f"   Documentation: {quality.documentation_quality}")
+        print(f"   Test Coverage: {quality.test_coverage_suggestion}")
+        
+        if report.positive_aspects:
             print("\n" + "-" * 80)
-            print("📊 CODE QUALITY METRICS")
+            print("✅ POSITIVE ASPECTS")
             print("-" * 80)
-            quality = report.code_quality
-            print(f"   Readability: {quality.readability_score}")
-            print(f"   Maintainability: {quality.maintainability_score}")
-            print(f"   Documentation: {quality.documentation_quality}")
-            print(f"   Test Coverage: {quality.test_coverage_suggestion}")
-            
-            if report.positive_aspects:
-                print("\n" + "-" * 80)
-                print("✅ POSITIVE ASPECTS")
-                print("-" * 80)
-                for aspect in report.positive_aspects:
-                    print(f"   • {aspect}")
-            
+            for aspect in report.positive_aspects:
+                print(f"   • {aspect}")
+        
+        print("\n" + "-" * 80)
+        print("🎯 PRIORITY FIXES")
+        print("-" * 80)
+        for i, fix in enumerate(report.priority_fixes, 1):
+            print(f"   {i}. {fix}")
+        
+        if report.learning_resources:
             print("\n" + "-" * 80)
-            print("🎯 PRIORITY FIXES")
+            print("📚 LEARNING RESOURCES")
             print("-" * 80)
-            for i, fix in enumerate(report.priority_fixes, 1):
-                print(f"   {i}. {fix}")
-            
-            if report.learning_resources:
-                print("\n" + "-" * 80)
-                print("📚 LEARNING RESOURCES")
-                print("-" * 80)
-                for resource in report.learning_resources:
-                    print(f"   • {resource}")
-            
-            print("\n" + "=" * 80)
-            
-        except Exception as e:
-            print(f"\n❌ Error during execution: {e}")
-            import traceback
-            traceback.print_exc()
+            for resource in report.learning_resources:
+                print(f"   • {resource}")
+        
+        print("\n" + "=" * 80)
+    
+    async def run_main():
+        batch = test_inputs if isinstance(test_inputs, list) else [test_inputs]
+        
+        # Reviews in a batch file run concurrently; main() caps the Groq
+        # requests they make in total (MAX_CONCURRENT_REQUESTS)
+        results = await asyncio.gather(*(main(inputs) for inputs in batch), return_exceptions=True)
+        
+        failed = False
+        for result in results:
+            if isinstance(result, BaseException):
+                print(f"\n❌ Error during execution: {result}")
+                import traceback
+                traceback.print_exception(type(result), result, result.__traceback__)
+                failed = True
+                continue
+            print_review(result)
+        
+        if failed:
             sys.exit(1)
     
     asyncio.run(run_main())
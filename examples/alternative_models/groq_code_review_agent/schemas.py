@@ -8,7 +8,7 @@ code review analysis.
 from __future__ import annotations
 
 from typing import List, Optional, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class CodeIssue(BaseModel):
@@ -127,3 +127,24 @@ class CodeReviewOutput(BaseModel):
         description="Recommended resources for improvement"
     )
 
+
+class CodeReviewBatchOutput(BaseModel):
+    """Reviews for several snippets returned by a single request."""
+    
+    reviews: List[CodeReviewOutput] = Field(
+        description="One review per snippet, in the same order as the snippets were given"
+    )
+
+
+# Built once at import so cached reviews are (de)serialized without rebuilding validators
+CODE_REVIEW_ADAPTER = TypeAdapter(CodeReviewOutput)
+
+
+def dump_review(report: CodeReviewOutput) -> bytes:
+    """Serialize a review report to JSON."""
+    return CODE_REVIEW_ADAPTER.dump_json(report)
+
+
+def load_review(data: str | bytes) -> CodeReviewOutput:
+    """Parse and validate a review report from JSON."""
+    return CODE_REVIEW_ADAPTER.validate_json(data)
@@ -6,7 +6,92 @@ Constructs comprehensive task descriptions based on input parameters.
 
 from __future__ import annotations
 
-from typing import Optional, List
+import ast
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
+
+
+JSON_FORMAT_REQUIREMENTS = """**CRITICAL - JSON Formatting Requirements**:
+
+1. **NO DUPLICATE KEYS**: Each JSON key must appear only once. Do NOT repeat keys like "positive_aspects" or "priority_fixes".
+
+2. **Plain String Values**: The following fields must be plain text strings, NOT JSON objects:
+   - `suggestion`: Plain text string (e.g., "Use parameterized queries")
+   - `code_example`: Plain text string with escaped quotes
+   - `description`: Plain text string
+   - `title`: Plain text string
+
+3. **Proper Quote Escaping**: When a string contains quotes, escape them with backslash.
+   - Correct: code_example field should be: query = "SELECT * FROM users WHERE name = ?"
+     (In JSON, this becomes: "code_example": "query = \\"SELECT * FROM users WHERE name = ?\\"")
+   - Wrong: Do NOT wrap in JSON objects like: "code_example": "{ \\"example\\": \\"SELECT...\\" }"
+
+4. **Complete JSON**: Ensure all strings are properly closed with quotes and the entire JSON is valid.
+
+5. **Validation**: Before returning, verify:
+   - No duplicate keys exist
+   - All strings are plain text (not wrapped in JSON objects)
+   - All quotes inside strings are escaped with backslash
+   - The entire JSON structure is valid and parseable"""
+
+
+MAX_REVIEW_CHUNK_CHARS = 4000
+
+
+def split_code(
+    code: str,
+    language: str,
+    max_chars: int = MAX_REVIEW_CHUNK_CHARS,
+) -> List[Tuple[int, int, str]]:
+    """Split long Python code into chunks of whole top-level definitions.
+    
+    Consecutive top-level statements are grouped until a chunk would exceed
+    ``max_chars``, so each chunk can be reviewed in its own smaller request.
+    Short code, other languages and code that doesn't parse are returned
+    as a single chunk; splitting other languages would need a parser such
+    as tree-sitter, which this example does not depend on.
+    
+    Args:
+        code: The code snippet to split
+        language: Programming language of the code
+        max_chars: Target maximum size of each chunk
+        
+    Returns:
+        List of (first_line, last_line, chunk) tuples with 1-based line numbers
+    """
+    lines = code.splitlines(keepends=True)
+    whole = [(1, max(len(lines), 1), code)]
+    if len(code) <= max_chars or language.lower() != "python":
+        return whole
+    
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return whole
+    
+    # Each top-level node owns the lines from its first line (decorators
+    # included) up to the next node, so comments between them are kept
+    starts = [
+        min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        for node in tree.body
+    ]
+    if len(starts) < 2:
+        return whole
+    starts[0] = 1
+    bounds = list(zip(starts, [start - 1 for start in starts[1:]] + [len(lines)]))
+    
+    chunks: List[Tuple[int, int, str]] = []
+    chunk_start, chunk_end, chunk_size = bounds[0][0], bounds[0][1], 0
+    for first, last in bounds:
+        size = sum(len(line) for line in lines[first - 1:last])
+        if chunk_size and chunk_size + size > max_chars:
+            chunks.append((chunk_start, chunk_end, "".join(lines[chunk_start - 1:chunk_end])))
+            chunk_start, chunk_size = first, 0
+        chunk_end = last
+        chunk_size += size
+    chunks.append((chunk_start, chunk_end, "".join(lines[chunk_start - 1:chunk_end])))
+    
+    return chunks
 
 
 def build_review_task(
@@ -26,6 +111,21 @@ def build_review_task(
     Returns:
         Comprehensive task description string
     """
+    head, tail = _review_template(language, tuple(focus_areas or ()), context)
+    return head + code + tail
+
+
+@lru_cache(maxsize=64)
+def _review_template(
+    language: str,
+    focus_areas: Tuple[str, ...],
+    context: Optional[str],
+) -> Tuple[str, str]:
+    """Render the parts of the review task before and after the code.
+    
+    Everything except the code depends only on these arguments, so batches
+    of snippets sharing them reuse one rendered template.
+    """
     focus_section = ""
     if focus_areas:
         focus_list = ", ".join(focus_areas)
@@ -41,11 +141,13 @@ def build_review_task(
     - Consider this context when evaluating design decisions
     - Tailor recommendations to fit the project requirements"""
     
-    task_description = f"""Perform a comprehensive code review of the following {language} code.
+    head = f"""Perform a comprehensive code review of the following {language} code.
 
 **Code to Review**:
 ```{language}
-{code}
+"""
+    
+    tail = f"""
 ```
 {focus_section}
 {context_section}
@@ -86,30 +188,55 @@ def build_review_task(
    - Suggest necessary documentation additions
    - Check for clear and helpful comments
 
-**CRITICAL - JSON Formatting Requirements**:
+{JSON_FORMAT_REQUIREMENTS}
 
-1. **NO DUPLICATE KEYS**: Each JSON key must appear only once. Do NOT repeat keys like "positive_aspects" or "priority_fixes".
+Provide your analysis with clear severity levels, specific code examples, actionable recommendations, and priority ordering."""
+    
+    return head, tail
 
-2. **Plain String Values**: The following fields must be plain text strings, NOT JSON objects:
-   - `suggestion`: Plain text string (e.g., "Use parameterized queries")
-   - `code_example`: Plain text string with escaped quotes
-   - `description`: Plain text string
-   - `title`: Plain text string
 
-3. **Proper Quote Escaping**: When a string contains quotes, escape them with backslash.
-   - Correct: code_example field should be: query = "SELECT * FROM users WHERE name = ?"
-     (In JSON, this becomes: "code_example": "query = \\"SELECT * FROM users WHERE name = ?\\"")
-   - Wrong: Do NOT wrap in JSON objects like: "code_example": "{{ \\"example\\": \\"SELECT...\\" }}"
+def build_batch_review_task(snippets: List[Dict[str, Any]]) -> str:
+    """Build one task description that reviews several snippets at once.
+    
+    Args:
+        snippets: Review inputs, each with ``code`` and ``language`` and
+            optional ``focus_areas`` and ``context``
+        
+    Returns:
+        Task description asking for one review per snippet, in order
+    """
+    sections = []
+    for index, snippet in enumerate(snippets, 1):
+        language = snippet["language"]
+        section = f"""### Snippet {index} ({language})
+"""
+        if snippet.get("focus_areas"):
+            section += f"""**Priority Focus Areas**: {", ".join(snippet["focus_areas"])}
+"""
+        if snippet.get("context"):
+            section += f"""**Project Context**: {snippet["context"]}
+"""
+        section += f"""```{language}
+{snippet["code"]}
+```"""
+        sections.append(section)
+    
+    snippets_section = "\n\n".join(sections)
+    
+    return f"""Perform a comprehensive code review of each of the following {len(snippets)} code snippets.
+Review every snippet independently and return exactly one review per snippet in the `reviews` list, in the same order as the snippets below.
 
-4. **Complete JSON**: Ensure all strings are properly closed with quotes and the entire JSON is valid.
+{snippets_section}
 
-5. **Validation**: Before returning, verify:
-   - No duplicate keys exist
-   - All strings are plain text (not wrapped in JSON objects)
-   - All quotes inside strings are escaped with backslash
-   - The entire JSON structure is valid and parseable
+**Review Requirements** (apply to every snippet):
 
-Provide your analysis with clear severity levels, specific code examples, actionable recommendations, and priority ordering."""
-    
-    return task_description
+1. **Bug Detection**: Identify potential bugs, logic errors and unhandled edge cases
+2. **Security Analysis**: Identify vulnerabilities, sensitive data exposure and missing input validation
+3. **Performance Review**: Analyze algorithmic complexity and suggest optimizations
+4. **Code Quality Assessment**: Evaluate readability, error handling, naming and structure
+5. **Best Practices**: Compare against the snippet language's best practices and suggest testing strategies
+6. **Documentation**: Assess documentation quality and suggest additions
+
+{JSON_FORMAT_REQUIREMENTS}
 
+Provide each analysis with clear severity levels, specific code examples, actionable recommendations, and priority ordering."""
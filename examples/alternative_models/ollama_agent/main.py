@@ -5,15 +5,46 @@ This example demonstrates how to create and use an Upsonic Agent with local Olla
 
 This file contains:
 - async main(inputs): For use with `upsonic run` CLI command (FastAPI server)
+- async stream(inputs): Streams the response text as it is generated
 - direct execution: For running as a script `python main.py`
 """
 
+import os
+from typing import AsyncIterator
+
+import httpx
 from upsonic import Agent, Task
 from upsonic.models.ollama import OllamaModel
 
+MODEL_NAME = "gpt-oss:20b"
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/").removesuffix("/v1")
+KEEP_ALIVE = "24h"
+
+
+def preload_model(model_name: str = MODEL_NAME) -> None:
+    """
+    Load the model into Ollama's memory before the first request.
+    
+    A generate call without a prompt makes Ollama load the weights without
+    generating anything, so the first real task doesn't pay the cold start.
+    """
+    try:
+        response = httpx.post(
+            f"{OLLAMA_BASE_URL}/api/generate",
+            json={"model": model_name, "keep_alive": KEEP_ALIVE},
+            timeout=300,
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        print(f"⚠️ Could not preload {model_name}: {e}")
+
+
 # Initialize the model
 # Ensure you have pulled the model: `ollama pull gpt-oss:20b`
-model = OllamaModel(model_name="gpt-oss:20b")
+model = OllamaModel(model_name=MODEL_NAME)
+
+if os.getenv("UPSONIC_PRELOAD", "1") == "1":
+    preload_model()
 
 
 async def main(inputs: dict) -> dict:
@@ -33,6 +64,23 @@ async def main(inputs: dict) -> dict:
     }
 
 
+async def stream(inputs: dict) -> AsyncIterator[str]:
+    """
+    Stream the response text chunk by chunk as the model generates it.
+    
+    Serve it with FastAPI's `StreamingResponse(stream(inputs), media_type="text/plain")`
+    so clients see the first tokens instead of waiting for the full answer.
+    """
+    user_query = inputs.get("user_query", "Hello, how are you?")
+    
+    agent = Agent(model=model)
+    
+    task = Task(description=user_query)
+    
+    async for chunk in agent.astream(task):
+        yield chunk
+
+
 if __name__ == "__main__":
     import asyncio
     
@@ -40,9 +88,12 @@ if __name__ == "__main__":
     inputs = {"user_query": "Hello, how are you?"}
     print(f"Task: {inputs['user_query']}")
     
-    result = asyncio.run(main(inputs))
+    async def print_stream():
+        async for chunk in stream(inputs):
+            print(chunk, end="", flush=True)
+        print()
     
     print("-" * 50)
     print("Result:")
-    print(result["bot_response"])
+    asyncio.run(print_stream())
     print("-" * 50)
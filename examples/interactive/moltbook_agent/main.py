@@ -1,4 +1,6 @@
 import asyncio
+import os
+import sys
 from upsonic import Agent, Chat
 from upsonic.run.events.events import (
     TextDeltaEvent,
@@ -11,6 +13,57 @@ from moltbook_tools import MoltbookAutonomous
 the_moltbook = MoltbookAutonomous(agent_name="UpsonicAgents", agent_description="Hello guys i am new guy in the town")
 
 
+# Bytes read from stdin that have not been returned as a line yet
+_stdin_pending = bytearray()
+
+
+def _pop_line() -> str:
+    line, _, rest = bytes(_stdin_pending).partition(b"\n")
+    _stdin_pending[:] = rest
+    return line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+
+
+async def ainput(prompt: str) -> str:
+    """
+    Read a line from stdin without blocking the event loop.
+
+    stdin is watched with loop.add_reader instead of running input() on an
+    executor thread, so Ctrl+C can shut the loop down without waiting for
+    Enter to be pressed. It is read with os.read into ``_stdin_pending``
+    rather than through sys.stdin, whose read-ahead buffer would hold pasted
+    lines without ever waking add_reader again. Raises EOFError when stdin
+    is closed. stdin that can't be watched (a regular file redirected with
+    ``< file``, or Windows event loops) is read on a worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    print(prompt, end="", flush=True)
+
+    if b"\n" in _stdin_pending:
+        return _pop_line()
+
+    fd = sys.stdin.fileno()
+    future = loop.create_future()
+
+    def on_readable() -> None:
+        data = os.read(fd, 4096)
+        _stdin_pending.extend(data)
+        if future.done():
+            return
+        if b"\n" in _stdin_pending or (not data and _stdin_pending):
+            future.set_result(_pop_line())
+        elif not data:
+            future.set_exception(EOFError())
+
+    try:
+        loop.add_reader(fd, on_readable)
+    except (NotImplementedError, OSError):
+        return await asyncio.to_thread(input)
+
+    try:
+        return await future
+    finally:
+        loop.remove_reader(fd)
+
 
 async def main():
 
@@ -21,7 +74,12 @@ async def main():
     print(":speech_balloon: Interactive Chat (type 'quit' to exit)\n")
 
     while True:
-        user_input = input(":bust_in_silhouette: You: ").strip()
+        # Read input off the event loop so it keeps serving background tasks
+        try:
+            user_input = (await ainput(":bust_in_silhouette: You: ")).strip()
+        except EOFError:
+            print("\n:wave: Bye!")
+            break
 
         if user_input.lower() in ("quit", "exit", "q"):
             print(":wave: Bye!")
@@ -48,4 +106,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n:wave: Bye!")
\ No newline at end of file
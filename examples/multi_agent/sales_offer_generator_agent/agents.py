@@ -1,17 +1,68 @@
 from upsonic import Agent
 from tools import SearchTools
 
+MIN_CANDIDATES = 3
+MAX_CANDIDATES = 5
+
+# Each agent's step instructions are fixed, so they live in its system prompt
+# and the per-request task only carries the customer's data. The shared
+# prompt prefix is also what OpenAI's automatic prompt caching reuses.
+GATE_PROMPT = """You screen incoming requests for a sales team that researches products and writes offer emails.
+Classify each request: in_domain if it asks for a product the customer could buy, out_of_domain if it does not,
+ambiguous if it is a product request too vague to research (then ask one short clarifying question)."""
+
+PLANNER_PROMPT = f"""You pick products to research for a sales offer.
+List {MIN_CANDIDATES} to {MAX_CANDIDATES} specific products (exact models or product lines) that are available now
+and match the customer requirements you are given."""
+
+RESEARCHER_PROMPT = """You research one product, sometimes for a customer with the given requirements.
+Confirm it is available now, summarize its key specs (those relevant to the customer, if requirements are given)
+and find current prices from real retailers."""
+
+STRATEGIST_PROMPT = """You are given customer requirements and market research findings.
+Select the best product for the customer and determine the best 'special offer' price."""
+
+WRITER_PROMPT = """You are given an offer (the selected product, its regular and special price, and the
+selling points that matter to this customer), sometimes together with the customer's requirements.
+Write the final sales offer email, personalized through those selling points, including the product and the special price.
+Output only the email."""
+
+
 class SalesAgents:
     """
     Factory class to create specialized agents for the Sales Offer Generator.
+
+    Every agent built by one factory shares the same search toolkit.
     """
 
+    def __init__(self):
+        self.search_tools = SearchTools()
+
+    def query_gate(self) -> Agent:
+        return Agent(
+            name="Query Gate",
+            role="Request Screener",
+            goal="Reject requests the sales team cannot make an offer for before any research starts.",
+            system_prompt=GATE_PROMPT,
+            model="openai/gpt-4o-mini"
+        )
+
+    def product_planner(self) -> Agent:
+        return Agent(
+            name="Product Planner",
+            role="Sales Assistant",
+            goal="Turn customer requirements into a short list of concrete products to research.",
+            system_prompt=PLANNER_PROMPT,
+            model="openai/gpt-4o-mini"
+        )
+
     def product_researcher(self) -> Agent:
         return Agent(
             name="Product Researcher",
             role="Search Specialist",
             goal="Identify the best products matching customer needs using real market data.",
-            tools=[SearchTools()],
+            system_prompt=RESEARCHER_PROMPT,
+            tools=[self.search_tools],
             model="openai/gpt-4o"
         )
 
@@ -20,7 +71,8 @@ class SalesAgents:
             name="Pricing Strategist",
             role="Market Analyst",
             goal="Analyze product pricing and determine a competitive offer strategy.",
-            tools=[SearchTools()], # Needs search to verify competitor prices if needed
+            system_prompt=STRATEGIST_PROMPT,
+            tools=[self.search_tools], # Needs search to verify competitor prices if needed
             model="openai/gpt-4o"
         )
 
@@ -29,5 +81,6 @@ class SalesAgents:
             name="Creative Copywriter",
             role="Sales Writer",
             goal="Draft a compelling, personalized sales offer email.",
+            system_prompt=WRITER_PROMPT,
             model="openai/gpt-4o"
         )
@@ -0,0 +1,238 @@
+"""
+Response caches for the Sales Offer Generator.
+
+Generating an offer takes several LLM calls and live web searches, so offers
+are cached and reused when a new request is close enough to an earlier one.
+"""
+import asyncio
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+from openai import AsyncOpenAI
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+
+CACHE_DIR = Path(os.getenv("OFFER_CACHE_DIR", "~/.cache/sales_offer_generator")).expanduser()
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+# With text-embedding-3-small, paraphrases of the same request usually score
+# around 0.85-0.95, and so do requests that differ only in a budget or a model
+# number. The threshold alone can't separate those, so entries must also have
+# exactly the same numbers (see hard_constraints).
+SIMILARITY_THRESHOLD = 0.92
+# Product names differ by a word or two between models (e.g. RTX 4080 vs 4090),
+# so reused research needs a much closer match than reused offers
+RESEARCH_SIMILARITY_THRESHOLD = 0.97
+# Offers quote live prices, so cached ones expire after a day
+OFFER_TTL_SECONDS = 24 * 60 * 60
+# Bounds the file size and the per-lookup similarity scan
+MAX_SEMANTIC_ENTRIES = 500
+# Bounds the in-process tier of each exact cache
+MAX_EXACT_ENTRIES = 1000
+
+# A lowercase "k" directly after a number (2k) means thousands; "4K" (video)
+# and "2 kg" do not. Digits after a letter still match, so "RTX4080" gives 4080.
+_NUMBER_RE = re.compile(r"(?<![\d.])(\d[\d,]*(?:\.\d+)?)(k\b)?")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase a query and collapse whitespace so trivial variations share a key."""
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+
+def hard_constraints(text: str) -> list[str]:
+    """
+    Extract the numbers in a query (budgets, model numbers, sizes).
+
+    "$2,000", "2000" and "2k" all become "2000", so only a real change in
+    a number makes two queries differ. Numbers are kept exact, so long model
+    numbers and SKUs never collide.
+    """
+    constraints = set()
+    for number, thousands in _NUMBER_RE.findall(text):
+        value = Decimal(number.replace(",", ""))
+        if thousands:
+            value *= 1000
+        constraints.add(_format_number(value))
+    return sorted(constraints)
+
+
+def _format_number(value: Decimal) -> str:
+    text = format(value, "f")
+    return text.rstrip("0").rstrip(".") if "." in text else text
+
+
+class ExactCache:
+    """
+    Cache of generated offers keyed by a hash of the normalized query.
+
+    Identical requests are answered from an in-process dict without any API
+    call. When ``REDIS_URL`` is set and the ``redis`` package is installed,
+    entries are also shared through Redis so they survive restarts and are
+    visible to every worker. ``namespace`` should identify the models and
+    agents producing the offers, so changing them invalidates old entries.
+    The in-process dict drops expired entries and keeps at most
+    ``max_entries``, evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float = OFFER_TTL_SECONDS,
+        max_entries: int = MAX_EXACT_ENTRIES,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        redis_url = os.getenv("REDIS_URL")
+        self._redis = redis.from_url(redis_url) if redis and redis_url else None
+
+    def key(self, query: str) -> str:
+        return hashlib.sha256(f"{self.namespace}|{normalize_query(query)}".encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._local.get(key)
+        if entry and entry[0] > time.time():
+            self._local.move_to_end(key)
+            return entry[1]
+        if entry:
+            del self._local[key]
+        if self._redis is not None:
+            try:
+                value = await self._redis.get(f"offer:{key}")
+            except Exception as e:
+                print(f"⚠️ Redis lookup failed: {e}")
+                return None
+            if value is not None:
+                response = json.loads(value)
+                self._remember(key, response)
+                return response
+        return None
+
+    async def set(self, key: str, response: str) -> None:
+        self._remember(key, response)
+        if self._redis is not None:
+            try:
+                await self._redis.setex(f"offer:{key}", int(self.ttl), json.dumps(response))
+            except Exception as e:
+                print(f"⚠️ Redis store failed: {e}")
+
+    def _remember(self, key: str, response: str) -> None:
+        now = time.time()
+        self._local[key] = (now + self.ttl, response)
+        self._local.move_to_end(key)
+        for stale_key in [k for k, (expires_at, _) in self._local.items() if expires_at <= now]:
+            del self._local[stale_key]
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class SemanticCache:
+    """
+    Cache of responses keyed by the embedding of the text that produced them.
+
+    A lookup returns the stored response of the most similar earlier text when
+    its cosine similarity reaches ``threshold`` and both texts carry the same
+    numbers, so rephrased requirements reuse an offer (or a product's
+    research) instead of rerunning the agents. Entries are persisted to a
+    JSON file for warm restarts, expire after ``ttl`` seconds and are capped
+    at ``max_entries`` (oldest dropped first).
+    """
+
+    def __init__(
+        self,
+        path: Path = CACHE_DIR / "semantic_cache.json",
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl: float = OFFER_TTL_SECONDS,
+        max_entries: int = MAX_SEMANTIC_ENTRIES,
+    ):
+        self.path = path
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._client: Optional[AsyncOpenAI] = None
+        self._entries: list[dict] = []
+        self._write_lock = threading.Lock()
+        self._version = 0
+        self._written_version = 0
+        if path.exists():
+            try:
+                self._entries = json.loads(path.read_text())
+            except (OSError, ValueError):
+                self._entries = []
+        self._evict()
+
+    async def embed(self, text: str) -> list[float]:
+        """Embed a query with the OpenAI embeddings API."""
+        if self._client is None:
+            self._client = AsyncOpenAI()
+        response = await self._client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+        return response.data[0].embedding
+
+    async def lookup(self, text: str, embedding: list[float]) -> Optional[str]:
+        """Return the cached response of the most similar fresh entry, if similar enough."""
+        self._evict()
+        # The similarity scan is pure-Python arithmetic over every entry, so it
+        # runs in a worker thread instead of on the event loop
+        return await asyncio.to_thread(self._best_match, hard_constraints(text), embedding, list(self._entries))
+
+    def _best_match(self, constraints: list[str], embedding: list[float], entries: list[dict]) -> Optional[str]:
+        best_score, best_response = 0.0, None
+        for entry in entries:
+            if entry.get("constraints") != constraints:
+                continue
+            score = _cosine(embedding, entry["embedding"])
+            if score > best_score:
+                best_score, best_response = score, entry["response"]
+        return best_response if best_score >= self.threshold else None
+
+    async def store(self, text: str, embedding: list[float], response: str) -> None:
+        """Add a response to the cache and persist it."""
+        self._entries.append({
+            "query": text,
+            "constraints": hard_constraints(text),
+            "embedding": embedding,
+            "response": response,
+            "created_at": time.time(),
+        })
+        self._evict()
+        self._version += 1
+        await asyncio.to_thread(self._persist, list(self._entries), self._version)
+
+    def _persist(self, entries: list[dict], version: int) -> None:
+        try:
+            with self._write_lock:
+                # Writes can finish out of order; never replace a newer snapshot
+                if version <= self._written_version:
+                    return
+                self._written_version = version
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(".tmp")
+                tmp_path.write_text(json.dumps(entries))
+                os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not persist offer cache: {e}")
+
+    def _evict(self) -> None:
+        cutoff = time.time() - self.ttl
+        self._entries = [entry for entry in self._entries if entry["created_at"] >= cutoff][-self.max_entries:]
@@ -5,11 +5,90 @@ This example demonstrates how to create and use an Agent that research products
 
 This file contains:
 - async main(inputs): For use with `upsonic run` CLI command (FastAPI server)
+- async stream(inputs): Streams the offer email as it is written
 """
 import asyncio
-from upsonic import Task
-from upsonic.agent.deepagent import DeepAgent
-from agents import SalesAgents
+from collections.abc import AsyncIterator
+from cache import CACHE_DIR, RESEARCH_SIMILARITY_THRESHOLD, ExactCache, SemanticCache
+from pipeline import SequentialOfferPipeline
+
+MODEL = "openai/gpt-4o"
+
+# Offers are reused for repeated (exact cache) and near-duplicate (semantic
+# cache) queries. The exact cache key covers the model and the agent team
+# so changing either invalidates old offers.
+_EXACT_CACHE = ExactCache(
+    namespace=f"{MODEL}|query_gate,product_planner,product_researcher,pricing_strategist,offer_writer"
+)
+_CACHE = SemanticCache()
+
+# Research findings (specs, prices, retailers) per product, kept on disk for a
+# day so later requests about the same product skip the researcher call
+_RESEARCH_STORE = SemanticCache(
+    path=CACHE_DIR / "research_store.json",
+    threshold=RESEARCH_SIMILARITY_THRESHOLD,
+)
+
+# Offer emails keyed by the strategist's decision (product and prices), so
+# differently worded requests that land on the same offer skip the writer
+_WRITER_CACHE = ExactCache(namespace=f"{MODEL}|offer_writer")
+
+
+async def _lookup_cached_offer(user_query: str) -> tuple[str, list[float] | None, str | None]:
+    """
+    Look a query up in the exact and semantic offer caches.
+
+    Returns the exact cache key, the query embedding (None if embedding
+    failed) and the cached offer, if any.
+    """
+    cache_key = _EXACT_CACHE.key(user_query)
+    cached_response = await _EXACT_CACHE.get(cache_key)
+    if cached_response is not None:
+        print("♻️ Reusing the offer generated for this exact request.")
+        return cache_key, None, cached_response
+
+    try:
+        query_embedding = await _CACHE.embed(user_query)
+    except Exception as e:
+        print(f"⚠️ Could not embed query, skipping offer cache: {e}")
+        return cache_key, None, None
+
+    cached_response = await _CACHE.lookup(user_query, query_embedding)
+    if cached_response is not None:
+        print("♻️ Reusing the offer generated for a similar earlier request.")
+        await _EXACT_CACHE.set(cache_key, cached_response)
+    return cache_key, query_embedding, cached_response
+
+
+# An upsonic Agent keeps the state of its current run, so it can't serve two
+# requests at once. The shared pipeline lends each request its own agents
+# from per-role pools, and only idle agents and the search tools are reused.
+_PIPELINE: SequentialOfferPipeline | None = None
+_PIPELINE_LOCK = asyncio.Lock()
+
+
+async def _get_pipeline() -> SequentialOfferPipeline:
+    """Return the shared pipeline, building it on first use."""
+    global _PIPELINE
+    if _PIPELINE is None:
+        async with _PIPELINE_LOCK:
+            if _PIPELINE is None:
+                _PIPELINE = await asyncio.to_thread(
+                    SequentialOfferPipeline,
+                    research_store=_RESEARCH_STORE,
+                    writer_cache=_WRITER_CACHE,
+                )
+    return _PIPELINE
+
+
+async def _store_offer(
+    cache_key: str, user_query: str, query_embedding: list[float] | None, offer: str
+) -> None:
+    """Add a generated offer to the exact and semantic caches."""
+    await _EXACT_CACHE.set(cache_key, offer)
+    if query_embedding is not None:
+        await _CACHE.store(user_query, query_embedding, offer)
+
 
 async def main(inputs: dict) -> dict:
     """
@@ -31,51 +110,70 @@ async def main(inputs: dict) -> dict:
     if not user_query:
         return {"bot_response": "Please provide a user_query."}
 
-    print("🚀 Starting Sales Offer Generator Agent (DeepAgent Mode)...\n")
+    print("🚀 Starting Sales Offer Generator Agent...\n")
 
-    # 1. Initialize Agents Factory
-    agents_factory = SalesAgents()
-
-    # 2. Create Specialist Agents
-    researcher = agents_factory.product_researcher()
-    strategist = agents_factory.pricing_strategist()
-    writer = agents_factory.offer_writer()
-
-    # 3. Initialize DeepAgent with the Team
-    # DeepAgent will automatically coordinate these subagents to fulfill the main task.
-    deep_agent = DeepAgent(
-        model="openai/gpt-4o",
-        subagents=[researcher, strategist, writer]
+    # Cache lookups are network-bound and building the agents (first request
+    # only) is CPU-bound, so both run at the same time
+    (cache_key, query_embedding, cached_response), pipeline = await asyncio.gather(
+        _lookup_cached_offer(user_query), _get_pipeline()
     )
+    if cached_response is not None:
+        return {"bot_response": cached_response}
 
     print(f"📋 Customer Requirements:\n{user_query}\n")
 
-    task = Task(description=f"""
-    Generate a complete, personalized sales offer email for a customer with these requirements:
-    "{user_query}"
+    reply = await pipeline.screen(user_query)
+    if reply is not None:
+        return {"bot_response": reply}
 
-    You must execute this in the following order:
-    1. MARKET RESEARCH: Use the Product Researcher to find at least 3 REAL products available now that match the specs. Get prices.
-    2. PRICING STRATEGY: Use the Pricing Strategist to analyze the findings and determine the best 'special offer' price.
-    3. EMAIL DRAFT: Use the Creative Copywriter to write the final sales email including the selected best product and the special price.
-    
-    Output the final email.
-    """)
-
-    # 5. Execute
-    print("🤖 DeepAgent is working...")
-    result = await deep_agent.do_async(task)
+    result = await pipeline.run(user_query)
 
     print("\n" + "="*50)
     print("Final Result:")
     print("="*50)
     print(result)
+
+    await _store_offer(cache_key, user_query, query_embedding, str(result))
     
     return {
         "bot_response": result
     }
 
 
+async def stream(inputs: dict) -> AsyncIterator[str]:
+    """
+    Stream the offer email chunk by chunk as the writer generates it.
+
+    Planning, research and pricing still run to completion first, but the
+    email text starts arriving as soon as the writer begins. Serve it with
+    FastAPI's `StreamingResponse(stream(inputs), media_type="text/plain")`.
+    Cached offers are yielded in one chunk.
+    """
+    user_query = inputs.get("user_query")
+    if not user_query:
+        yield "Please provide a user_query."
+        return
+
+    (cache_key, query_embedding, cached_response), pipeline = await asyncio.gather(
+        _lookup_cached_offer(user_query), _get_pipeline()
+    )
+    if cached_response is not None:
+        yield cached_response
+        return
+
+    reply = await pipeline.screen(user_query)
+    if reply is not None:
+        yield reply
+        return
+
+    chunks = []
+    async for chunk in pipeline.stream(user_query):
+        chunks.append(chunk)
+        yield chunk
+
+    await _store_offer(cache_key, user_query, query_embedding, "".join(chunks))
+
+
 if __name__ == "__main__":
     # Test execution
     test_input = {
@@ -0,0 +1,270 @@
+"""
+Fixed plan -> research -> price -> write workflow for the Sales Offer Generator.
+
+The steps always run in the same order, so they are chained directly instead
+of asking an orchestrator LLM to decide which agent runs next.
+"""
+import asyncio
+import json
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+from upsonic import Agent, Task
+from agents import MAX_CANDIDATES, SalesAgents
+from cache import ExactCache, SemanticCache
+from schemas import OfferStrategy, ProductCandidates, QueryVerdict
+
+OUT_OF_DOMAIN_RESPONSE = (
+    "I can only help with product offers. Tell me what you'd like to buy, "
+    "for example: 'a laptop for video editing under $3,000'."
+)
+
+# Caps concurrent researcher calls so parallel research stays under provider rate limits
+MAX_CONCURRENT_RESEARCH = 5
+
+
+class AgentPool:
+    """
+    Reusable agents of one role, each lent to one run at a time.
+
+    An upsonic Agent keeps its current run (output, run id, task, tool call
+    count) on the instance, so two concurrent ``do_async`` calls on one agent
+    can swap outputs. ``checkout`` hands out an idle agent, or builds a new
+    one in a worker thread when all are busy, and takes it back afterwards.
+    """
+
+    def __init__(self, build: Callable[[], Agent]):
+        self._build = build
+        # One agent is built up front, so the first run skips the build
+        self._idle: list[Agent] = [build()]
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[Agent]:
+        agent = self._idle.pop() if self._idle else await asyncio.to_thread(self._build)
+        try:
+            yield agent
+        finally:
+            self._idle.append(agent)
+
+
+class SequentialOfferPipeline:
+    """
+    Runs the sales agents as a fixed sequence of steps.
+
+    0. The query gate screens out requests that are not product requests
+       (see ``screen``), so they don't cost a full pipeline run.
+    1. The planner lists candidate products.
+    2. Researchers investigate every candidate concurrently, each product on
+       its own agent from the ``researchers`` pool.
+    3. The strategist picks the best product and the special offer price.
+    4. The writer drafts the offer email.
+
+    Every role keeps an ``AgentPool``, and each step checks an agent out for
+    its one call, so one pipeline can serve concurrent requests. When a
+    ``research_store`` is given, research findings are stored per product
+    and reused for later requests about the same product. When a
+    ``writer_cache`` is given, emails are reused for requests that end up
+    with the same offer (product, prices and selling points).
+    """
+
+    def __init__(
+        self,
+        agents_factory: SalesAgents | None = None,
+        research_store: SemanticCache | None = None,
+        writer_cache: ExactCache | None = None,
+    ):
+        agents_factory = agents_factory or SalesAgents()
+        self.research_store = research_store
+        self.writer_cache = writer_cache
+        self.gates = AgentPool(agents_factory.query_gate)
+        self.planners = AgentPool(agents_factory.product_planner)
+        self.researchers = AgentPool(agents_factory.product_researcher)
+        self.strategists = AgentPool(agents_factory.pricing_strategist)
+        self.writers = AgentPool(agents_factory.offer_writer)
+
+    async def screen(self, user_query: str) -> str | None:
+        """
+        Check that a request is something the team can make an offer for.
+
+        Returns a reply to send instead of an offer (a refusal or a clarifying
+        question), or None if the pipeline should run. If the gate itself
+        fails, the request is let through.
+        """
+        try:
+            async with self.gates.checkout() as gate:
+                verdict = await gate.do_async(Task(
+                    description=f'Customer request: "{user_query}"',
+                    response_format=QueryVerdict,
+                ))
+        except Exception as e:
+            print(f"⚠️ Query gate failed, continuing without it: {e}")
+            return None
+
+        if verdict.verdict == "out_of_domain":
+            return OUT_OF_DOMAIN_RESPONSE
+        if verdict.verdict == "ambiguous" and verdict.clarifying_question:
+            return verdict.clarifying_question
+        return None
+
+    async def plan(self, user_query: str) -> list[str]:
+        """Return the candidate products to research."""
+        async with self.planners.checkout() as planner:
+            candidates = await planner.do_async(Task(
+                description=f'Customer requirements: "{user_query}"',
+                response_format=ProductCandidates,
+            ))
+        return list(dict.fromkeys(candidates.products))[:MAX_CANDIDATES] or [user_query]
+
+    async def research(self, user_query: str, products: list[str]) -> str:
+        """Research each candidate product concurrently and join the findings."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_RESEARCH)
+
+        async def research_product(product: str):
+            embedding = await self._stored_research_key(product)
+            if embedding is not None:
+                stored = await self.research_store.lookup(product, embedding)
+                if stored is not None:
+                    print(f"♻️ Reusing stored research for {product}")
+                    return stored
+
+            async with semaphore, self.researchers.checkout() as researcher:
+                result = await researcher.do_async(self.research_task(user_query, product))
+
+            if embedding is not None:
+                await self.research_store.store(product, embedding, str(result))
+            return result
+
+        results = await asyncio.gather(
+            *(research_product(product) for product in products), return_exceptions=True
+        )
+
+        findings = []
+        for product, result in zip(products, results):
+            if isinstance(result, BaseException):
+                print(f"⚠️ Research for {product} failed, continuing without it: {result}")
+                continue
+            findings.append(f"### {product}\n{result}")
+        if not findings:
+            raise RuntimeError("Market research failed for every candidate product")
+        return "\n\n".join(findings)
+
+    def research_task(self, user_query: str, product: str) -> Task:
+        """
+        Build the researcher's task for one product.
+
+        With a research store, findings are reused for other customers, so
+        the researcher sees only the product and writes neutral findings.
+        The strategist still tailors the offer to the customer's requirements.
+        """
+        if self.research_store:
+            return Task(description=f"Product: {product}")
+        return Task(description=f'Customer requirements: "{user_query}"\nProduct: {product}')
+
+    async def _stored_research_key(self, product: str) -> list[float] | None:
+        """Embed a product name for the research store, or None if there is no usable store."""
+        if self.research_store is None:
+            return None
+        try:
+            return await self.research_store.embed(product)
+        except Exception as e:
+            print(f"⚠️ Could not embed {product}, skipping the research store: {e}")
+            return None
+
+    async def price(self, user_query: str, research: str) -> OfferStrategy:
+        """Return the pricing strategy for the researched products."""
+        async with self.strategists.checkout() as strategist:
+            return await strategist.do_async(Task(
+                description=f'Customer requirements: "{user_query}"\n\nMarket research findings:\n{research}',
+                response_format=OfferStrategy,
+            ))
+
+    def writer_task(self, user_query: str, strategy: OfferStrategy) -> Task:
+        """
+        Build the writer's task.
+
+        With a writer cache, the writer only sees the canonical offer (see
+        ``canonical_offer``), not the customer's wording. An email reused
+        from the cache then contains nothing from another customer's request.
+        It is personalized through the strategist's selling points only.
+        """
+        if self.writer_cache:
+            return Task(description=f"Offer:\n{self.canonical_offer(strategy)}")
+        return Task(
+            description=f'Customer requirements: "{user_query}"\n\nPricing strategy:\n{strategy.model_dump_json(indent=2)}'
+        )
+
+    @staticmethod
+    def canonical_offer(strategy: OfferStrategy) -> str:
+        """
+        Serialize the customer-facing parts of an offer deterministically.
+
+        The product name and selling points are whitespace-normalized, the
+        selling points are sorted, prices are rounded to cents, and keys are
+        sorted. Differently worded requests that converge on the same offer
+        therefore produce the same text.
+        """
+        return json.dumps(
+            {
+                "product_name": " ".join(strategy.product_name.split()),
+                "regular_price": round(strategy.regular_price, 2),
+                "offer_price": round(strategy.offer_price, 2),
+                "currency": strategy.currency.upper(),
+                "selling_points": sorted(" ".join(point.split()) for point in strategy.selling_points),
+            },
+            indent=2,
+            sort_keys=True,
+        )
+
+    def writer_cache_key(self, strategy: OfferStrategy) -> str:
+        """Key the writer cache by the canonical offer, which is all the writer sees."""
+        return self.writer_cache.key(self.canonical_offer(strategy))
+
+    async def prepare(self, user_query: str) -> OfferStrategy:
+        """Run the planning, research and pricing steps and return the strategy."""
+        print("🧭 Picking candidate products...")
+        products = await self.plan(user_query)
+
+        print(f"🔎 Researching {len(products)} products...")
+        research = await self.research(user_query, products)
+
+        print("💰 Working out the offer price...")
+        return await self.price(user_query, research)
+
+    async def run(self, user_query: str) -> str:
+        """Run every step and return the offer email."""
+        strategy = await self.prepare(user_query)
+
+        cache_key = self.writer_cache_key(strategy) if self.writer_cache else None
+        if cache_key:
+            cached_email = await self.writer_cache.get(cache_key)
+            if cached_email is not None:
+                print("♻️ Reusing the email written for the same offer.")
+                return cached_email
+
+        print("✍️ Writing the offer email...")
+        async with self.writers.checkout() as writer:
+            email = str(await writer.do_async(self.writer_task(user_query, strategy)))
+
+        if cache_key:
+            await self.writer_cache.set(cache_key, email)
+        return email
+
+    async def stream(self, user_query: str) -> AsyncIterator[str]:
+        """Run every step, yielding the offer email as the writer produces it."""
+        strategy = await self.prepare(user_query)
+
+        cache_key = self.writer_cache_key(strategy) if self.writer_cache else None
+        if cache_key:
+            cached_email = await self.writer_cache.get(cache_key)
+            if cached_email is not None:
+                yield cached_email
+                return
+
+        chunks = []
+        async with self.writers.checkout() as writer:
+            async for chunk in writer.astream(self.writer_task(user_query, strategy)):
+                chunks.append(chunk)
+                yield chunk
+
+        if cache_key:
+            await self.writer_cache.set(cache_key, "".join(chunks))
@@ -0,0 +1,36 @@
+"""
+Output schemas for the Sales Offer Generator agents.
+"""
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProductCandidates(BaseModel):
+    """Products worth researching for a customer request."""
+    products: list[str] = Field(
+        description="Specific product models or product lines that match the customer's requirements"
+    )
+
+
+class QueryVerdict(BaseModel):
+    """Whether a customer request is something the sales team can make an offer for."""
+    verdict: Literal["in_domain", "out_of_domain", "ambiguous"] = Field(
+        description="in_domain: a request for a purchasable product; "
+        "out_of_domain: not a product request; "
+        "ambiguous: a product request too vague to research"
+    )
+    clarifying_question: Optional[str] = Field(
+        default=None,
+        description="For ambiguous requests, one short question that would make the request specific enough"
+    )
+
+
+class OfferStrategy(BaseModel):
+    """The pricing strategist's decision for one offer."""
+    product_name: str = Field(description="Exact name of the product selected for the customer")
+    regular_price: float = Field(description="Typical current market price of the product")
+    offer_price: float = Field(description="Special offer price to quote to the customer")
+    currency: str = Field(default="USD", description="ISO currency code of the prices")
+    selling_points: list[str] = Field(description="Reasons this product fits the customer's requirements")
+    rationale: str = Field(description="Why this product and offer price were chosen")
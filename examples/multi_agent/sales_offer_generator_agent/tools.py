@@ -1,15 +1,101 @@
+import asyncio
+import threading
+import time
+
 from upsonic.tools import tool, ToolKit
 from ddgs import DDGS
 
 
+# Search results include prices, so they are reused for a few hours only
+SEARCH_TTL_SECONDS = 6 * 60 * 60
+MAX_PARALLEL_SEARCHES = 5
+# Snippets are trimmed so search results add fewer input tokens to later LLM calls
+MAX_SNIPPET_CHARS = 300
+# Bounds memory in the long-running API server
+MAX_CACHED_SEARCHES = 1000
+
+_ddgs: DDGS | None = None
+_search_cache: dict[str, tuple[float, list[dict]]] = {}
+# Per-query lock and the number of callers holding or waiting on it; the
+# entry is removed when the last caller is done
+_search_locks: dict[str, tuple[threading.Lock, int]] = {}
+_locks_guard = threading.Lock()
+
+
+def _get_ddgs() -> DDGS:
+    """Return the shared DDGS client, created on first use."""
+    global _ddgs
+    if _ddgs is None:
+        _ddgs = DDGS()
+    return _ddgs
+
+
+def _cached_search(query: str) -> list[dict]:
+    """
+    Run a DuckDuckGo text search, reusing results for SEARCH_TTL_SECONDS.
+
+    Concurrent calls for the same query wait on a per-query lock, so the
+    researcher and strategist share one request instead of issuing two.
+    """
+    key = " ".join(query.lower().split())
+    with _locks_guard:
+        lock, users = _search_locks.get(key, (None, 0))
+        lock = lock or threading.Lock()
+        _search_locks[key] = (lock, users + 1)
+
+    try:
+        with lock:
+            return _search_locked(key, query)
+    finally:
+        with _locks_guard:
+            lock, users = _search_locks[key]
+            if users == 1:
+                del _search_locks[key]
+            else:
+                _search_locks[key] = (lock, users - 1)
+
+
+def _search_locked(key: str, query: str) -> list[dict]:
+    cached = _search_cache.get(key)
+    if cached and cached[0] > time.time():
+        return cached[1]
+
+    results = list(_get_ddgs().text(query, max_results=5))
+    if not results:
+        # Empty results are not cached so a transient failure is retried
+        return []
+
+    records = [
+        {"title": r["title"], "href": r["href"], "body": r["body"][:MAX_SNIPPET_CHARS]}
+        for r in results
+    ]
+    with _locks_guard:
+        _search_cache.pop(key, None)
+        _search_cache[key] = (time.time() + SEARCH_TTL_SECONDS, records)
+        _evict_searches()
+    return records
+
+
+def _evict_searches() -> None:
+    """Drop expired results, then the oldest ones beyond MAX_CACHED_SEARCHES. Call with _locks_guard held."""
+    now = time.time()
+    for key in [key for key, (expires_at, _) in _search_cache.items() if expires_at <= now]:
+        del _search_cache[key]
+    while len(_search_cache) > MAX_CACHED_SEARCHES:
+        del _search_cache[next(iter(_search_cache))]
+
+
 class SearchTools(ToolKit):
     """
     Toolkit for performing internet searches to gather real-time data
     about products, competitors, and market trends.
     """
 
+    # The tools are async so agents running concurrently don't block the event
+    # loop; the blocking DDGS request itself runs in a worker thread.
+
     @tool
-    def search_internet(self, query: str) -> str:
+    async def search_internet(self, query: str) -> list[dict]:
         """
         Searches the internet for a general query.
         Useful for finding product specs, reviews, or general market info.
@@ -18,22 +104,37 @@ class SearchTools(ToolKit):
             query: The search string (e.g., "latest specialized gaming laptops 2024").
 
         Returns:
-            A string summary of the top search results.
+            The top search results, each with "title", "href" and a short "body" snippet.
+            An empty list means nothing was found.
+        """
+        return await asyncio.to_thread(_cached_search, query)
+
+    @tool
+    async def search_many(self, queries: list[str]) -> dict[str, list[dict]]:
+        """
+        Searches the internet for several queries at once.
+        Prefer this over repeated search_internet calls when comparing
+        multiple products, since the searches run in parallel.
+
+        Args:
+            queries: The search strings (e.g., ["Dell XPS 15 price", "MacBook Pro M3 Max price"]).
+
+        Returns:
+            A mapping of each query to its top search results, each with "title",
+            "href" and a short "body" snippet.
         """
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=5))
-        
-        if not results:
-            return "No results found."
-            
-        formatted_results = []
-        for r in results:
-            formatted_results.append(f"Title: {r['title']}\nLink: {r['href']}\nSnippet: {r['body']}")
-            
-        return "\n\n".join(formatted_results)
+        queries = list(dict.fromkeys(queries))
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_SEARCHES)
+
+        async def search(query: str) -> list[dict]:
+            async with semaphore:
+                return await asyncio.to_thread(_cached_search, query)
+
+        results = await asyncio.gather(*(search(query) for query in queries))
+        return dict(zip(queries, results))
 
     @tool
-    def find_product_prices(self, product_name: str) -> str:
+    async def find_product_prices(self, product_name: str) -> list[dict]:
         """
         Specifically searches for pricing information for a given product.
 
@@ -41,7 +142,8 @@ class SearchTools(ToolKit):
             product_name: The specific name of the product (e.g., "MacBook Pro M3 Max").
 
         Returns:
-            A list of found price points and retailers.
+            Search results for retailer listings, each with "title", "href" and a
+            short "body" snippet that usually contains the price.
         """
         query = f"{product_name} price buy online"
-        return self.search_internet(query)
+        return await asyncio.to_thread(_cached_search, query)
@@ -20,6 +20,15 @@ from upsonic.safety_engine.policies.pii_policies import PIIBlockPolicy_LLM
 from upsonic.safety_engine.llm.upsonic_llm import UpsonicLLMProvider
 
 
+# Set the LLM for the policy to use gpt-oss-safeguard-20b via OpenRouter.
+# Built once at import so every request reuses the same provider.
+policy_llm = UpsonicLLMProvider(
+    agent_name="PII Policy LLM",
+    model="openrouter/openai/gpt-oss-safeguard-20b"
+)
+PIIBlockPolicy_LLM.base_llm = policy_llm
+
+
 async def main(inputs):
     """
     Main function for the Safety Agent.
@@ -32,15 +41,8 @@ async def main(inputs):
     """
     user_query = inputs.get("user_query")
     
-    answering_task = Task(f"Answer the user question: {user_query}")
-    
-    # Set the LLM for the policy to use gpt-oss-safeguard-20b via OpenRouter
-    policy_llm = UpsonicLLMProvider(
-        agent_name="PII Policy LLM",
-        model="openrouter/openai/gpt-oss-safeguard-20b"
-    )
-    PIIBlockPolicy_LLM.base_llm = policy_llm
-    
+    # The agent keeps the state of its current run, so concurrent requests
+    # each get their own instead of sharing one
     agent = Agent(
         model='openai/gpt-4o',
         user_policy=PIIBlockPolicy_LLM,
@@ -49,6 +51,8 @@ async def main(inputs):
         debug=True
     )
     
+    answering_task = Task(f"Answer the user question: {user_query}")
+    
     result = await agent.print_do_async(answering_task)
     
     return {
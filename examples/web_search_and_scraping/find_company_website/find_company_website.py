@@ -11,7 +11,15 @@ Educational focus: letting the Agent, not the code, make the reasoning decisions
 
 import os, json, requests
 from typing import Optional
+from urllib.parse import urlparse
 from pydantic import BaseModel, HttpUrl
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
 from upsonic import Agent, Task
 from dotenv import load_dotenv
 
@@ -21,10 +29,48 @@ SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 SERPER_URL = "https://google.serper.dev/search"
 HEADERS = {"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"}
 
+
+def _build_session() -> requests.Session:
+    """Create a keep-alive session so repeated Serper calls reuse one connection.
+
+    If `requests-cache` is installed, responses are also cached on disk for a day
+    (set SERPER_CACHE=0 to opt out), so re-runs don't spend API quota.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),
+    )
+    if requests_cache is not None and os.getenv("SERPER_CACHE", "1") != "0":
+        session = requests_cache.CachedSession(
+            "serper_cache",
+            backend="sqlite",
+            expire_after=86400,
+            allowable_methods=("GET", "POST"),
+            match_headers=False,
+        )
+    else:
+        session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+    session.headers.update(HEADERS)
+    return session
+
+
+_SESSION = _build_session()
+
 BAD_DOMAINS = [
     "linkedin.com", "facebook.com", "twitter.com", "x.com",
     "youtube.com", "crunchbase.com", "wikipedia.org", "glassdoor.com"
 ]
+BAD_HOSTS = frozenset(BAD_DOMAINS)
+BAD_HOST_SUFFIXES = tuple("." + d for d in BAD_DOMAINS)
+
+
+def _is_bad_host(url: str) -> bool:
+    """Check whether a URL points at (a subdomain of) an excluded domain."""
+    host = (urlparse(url).hostname or "").lower()
+    return host in BAD_HOSTS or host.endswith(BAD_HOST_SUFFIXES)
 
 
 # --- Pydantic response model ---
@@ -39,11 +85,11 @@ class WebsiteResponse(BaseModel):
 # --- TOOL: Fetch candidate websites ---
 def get_company_candidates(company: str) -> list[str]:
     """Simple search tool to get top candidate URLs for a company."""
-    resp = requests.post(SERPER_URL, headers=HEADERS, json={"q": company})
+    resp = _SESSION.post(SERPER_URL, json={"q": company}, timeout=30)
     resp.raise_for_status()
     data = resp.json()
     links = [r["link"] for r in data.get("organic", []) if "link" in r]
-    return [u for u in links if not any(bad in u for bad in BAD_DOMAINS)]
+    return [u for u in links if not _is_bad_host(u)]
 
 
 # --- MAIN AGENT ---
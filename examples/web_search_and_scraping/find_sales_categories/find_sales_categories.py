@@ -13,10 +13,12 @@ Usage:
 """
 
 import argparse
+import asyncio
 import json
 import os
 import re
 import sys
+import httpx
 import requests
 from bs4 import BeautifulSoup
 from upsonic import Agent, Task
@@ -35,9 +37,8 @@ from find_company_website.find_company_website import (  # noqa: E402
 # 1. Website Finder Wrapper
 # ======================================================
 
-def find_company_website(company_name: str) -> WebsiteResponse:
-    """Invoke the website-finder agent and return its structured response."""
-    task = Task(
+def _website_task(company_name: str) -> Task:
+    return Task(
         description=(
             "Use the get_company_candidates tool to locate the official website for "
             f"'{company_name}'. Prefer domains that match the brand name and avoid social "
@@ -46,7 +47,21 @@ def find_company_website(company_name: str) -> WebsiteResponse:
         tools=[get_company_candidates],
         response_format=WebsiteResponse,
     )
-    return website_agent.do(task)
+
+
+def find_company_website(company_name: str) -> WebsiteResponse:
+    """Invoke the website-finder agent and return its structured response."""
+    return website_agent.do(_website_task(company_name))
+
+
+async def afind_company_website(company_name: str) -> WebsiteResponse:
+    """Async version of find_company_website.
+
+    An upsonic Agent keeps its current run on the instance, so concurrent
+    calls must not share one; each call builds its own website agent.
+    """
+    agent = Agent(name=website_agent.name)
+    return await agent.do_async(_website_task(company_name))
 
 
 # ======================================================
@@ -90,6 +105,50 @@ def _normalize_categories(raw_result) -> list[str]:
 # 3. Tool: Extract Ecommerce Categories
 # ======================================================
 
+MAX_HTML_BYTES = 2_000_000
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml")
+DISALLOWED_LABELS = frozenset({
+    "home","about","contact","blog","support","faq","login","signup","account",
+    "search","cart","wishlist","privacy","terms","careers","help","investors",
+    "feedback","site map","accessibility","language","english","français","español"
+})
+_WHITESPACE_RE = re.compile(r"\s+")
+_HAS_LETTER_RE = re.compile(r"[^\W\d_]")
+
+
+def _fetch_html(url: str) -> str:
+    """Download a page as HTML, skipping non-HTML bodies and capping its size."""
+    headers = {"User-Agent": "Mozilla/5.0"}
+    with requests.get(url, headers=headers, timeout=10, stream=True) as resp:
+        resp.raise_for_status()
+        content_type = resp.headers.get("Content-Type", "").lower()
+        if content_type and not content_type.startswith(HTML_CONTENT_TYPES):
+            return ""
+
+        buf = bytearray()
+        for chunk in resp.iter_content(16384):
+            buf.extend(chunk)
+            if len(buf) > MAX_HTML_BYTES:
+                break
+        return buf.decode(resp.encoding or "utf-8", errors="replace")
+
+
+async def _afetch_html(client: httpx.AsyncClient, url: str) -> str:
+    """Async version of _fetch_html on a shared httpx client."""
+    async with client.stream("GET", url) as resp:
+        resp.raise_for_status()
+        content_type = resp.headers.get("Content-Type", "").lower()
+        if content_type and not content_type.startswith(HTML_CONTENT_TYPES):
+            return ""
+
+        buf = bytearray()
+        async for chunk in resp.aiter_bytes(16384):
+            buf.extend(chunk)
+            if len(buf) > MAX_HTML_BYTES:
+                break
+        return buf.decode(resp.encoding or "utf-8", errors="replace")
+
+
 @tool
 def extract_categories(website_url: str) -> list[str]:
     """Scrape potential ecommerce category labels from navigation menus."""
@@ -97,14 +156,34 @@ def extract_categories(website_url: str) -> list[str]:
         return []
 
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(website_url, headers=headers, timeout=10)
-        resp.raise_for_status()
+        html = _fetch_html(website_url)
     except Exception as e:
         print(f"Error fetching {website_url}: {e}")
         return []
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    return _parse_categories(html)
+
+
+async def aextract_categories(client: httpx.AsyncClient, website_url: str) -> list[str]:
+    """Async version of extract_categories on a shared httpx client."""
+    if not website_url:
+        return []
+
+    try:
+        html = await _afetch_html(client, website_url)
+    except Exception as e:
+        print(f"Error fetching {website_url}: {e}")
+        return []
+
+    return _parse_categories(html)
+
+
+def _parse_categories(html: str) -> list[str]:
+    """Collect candidate category labels from the navigation menus of a page."""
+    if not html:
+        return []
+
+    soup = BeautifulSoup(html, "html.parser")
 
     candidate_roots = soup.select(
         "nav, header, [class*='menu'], [id*='menu'], [class*='nav'], "
@@ -113,25 +192,19 @@ def extract_categories(website_url: str) -> list[str]:
     if not candidate_roots:
         candidate_roots = [soup]
 
-    disallowed = {
-        "home","about","contact","blog","support","faq","login","signup","account",
-        "search","cart","wishlist","privacy","terms","careers","help","investors",
-        "feedback","site map","accessibility","language","english","français","español"
-    }
-
     cats, seen = [], set()
     for root in candidate_roots:
         for link in root.find_all("a", href=True):
             text = link.get_text(" ", strip=True)
             if not text:
                 continue
-            clean = re.sub(r"\s+", " ", text).strip()
+            clean = _WHITESPACE_RE.sub(" ", text).strip()
             lower = clean.lower()
             if len(lower) < 3 or len(lower) > 40:
                 continue
-            if lower in disallowed:
+            if lower in DISALLOWED_LABELS:
                 continue
-            if not any(c.isalpha() for c in lower):
+            if not _HAS_LETTER_RE.search(lower):
                 continue
             if lower in seen:
                 continue
@@ -147,22 +220,16 @@ def extract_categories(website_url: str) -> list[str]:
 
 sales_category_agent = Agent(name="sales_category_agent")
 
-def find_sales_categories(company_name: str) -> dict:
-    """Find company website and extract its main shopping categories."""
-    website_result = find_company_website(company_name)
-    if not website_result.website:
-        return {
-            "company": company_name,
-            "website": "",
-            "categories": [],
-            "reason": website_result.reasoning,
-        }
+# Refined category lists keyed by (company, raw candidate labels), so a batch
+# that repeats a company does not pay for the same LLM call twice. Refinements
+# still running are kept in _refining, so concurrent callers with the same
+# key wait for the one call instead of starting another.
+_refined_cache: dict[tuple[str, tuple[str, ...]], list[str]] = {}
+_refining: dict[tuple[str, tuple[str, ...]], asyncio.Future] = {}
 
-    # Step 1: Extract candidate labels via HTML
-    raw_categories = extract_categories(str(website_result.website))
 
-    # Step 2: Let the LLM interpret the real shopping categories
-    task = Task(
+def _category_task(company_name: str, raw_categories: list[str], agent: Agent = sales_category_agent) -> Task:
+    return Task(
         description=(
             f"You are analyzing the ecommerce structure of {company_name}'s official website. "
             f"From the list below, identify the website's *main shopping or product categories* — "
@@ -172,11 +239,89 @@ def find_sales_categories(company_name: str) -> dict:
             f"Candidate categories:\n{raw_categories}\n\n"
             f"Return a clean JSON list of the main shopping categories only."
         ),
-        agent=sales_category_agent,
+        agent=agent,
     )
 
-    refined = sales_category_agent.do(task)
-    categories = _normalize_categories(refined)
+
+def _empty_result(company_name: str, website_result: WebsiteResponse) -> dict:
+    return {
+        "company": company_name,
+        "website": "",
+        "categories": [],
+        "reason": website_result.reasoning,
+    }
+
+
+def find_sales_categories(company_name: str) -> dict:
+    """Find company website and extract its main shopping categories."""
+    website_result = find_company_website(company_name)
+    if not website_result.website:
+        return _empty_result(company_name, website_result)
+
+    # Step 1: Extract candidate labels via HTML
+    raw_categories = extract_categories(str(website_result.website))
+
+    # Step 2: Let the LLM interpret the real shopping categories
+    key = (company_name, tuple(raw_categories))
+    if key not in _refined_cache:
+        refined = sales_category_agent.do(_category_task(company_name, raw_categories))
+        _refined_cache[key] = _normalize_categories(refined)
+
+    return {
+        "company": company_name,
+        "website": str(website_result.website),
+        "categories": _refined_cache[key],
+        "reason": website_result.reasoning,
+    }
+
+
+async def _arefine_categories(company_name: str, raw_categories: list[str]) -> list[str]:
+    """Let the LLM pick the real shopping categories, sharing the call between concurrent callers."""
+    key = (company_name, tuple(raw_categories))
+    if key in _refined_cache:
+        return _refined_cache[key]
+
+    task = _refining.get(key)
+    if task is None:
+        async def refine() -> list[str]:
+            # Each refinement runs on its own agent, as concurrent runs must not share one
+            agent = Agent(name=sales_category_agent.name)
+            refined = await agent.do_async(_category_task(company_name, raw_categories, agent))
+            _refined_cache[key] = _normalize_categories(refined)
+            return _refined_cache[key]
+
+        task = _refining[key] = asyncio.ensure_future(refine())
+        task.add_done_callback(lambda _: _refining.pop(key, None))
+
+    # Shielded so one caller being cancelled does not cancel the shared call
+    return await asyncio.shield(task)
+
+
+def _http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        headers={"User-Agent": "Mozilla/5.0"},
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=10.0,
+        follow_redirects=True,
+    )
+
+
+async def afind_sales_categories(company_name: str, client: httpx.AsyncClient | None = None) -> dict:
+    """Async version of find_sales_categories.
+
+    Pass a shared ``client`` to pool connections across companies; otherwise a
+    short-lived one is created for this call.
+    """
+    if client is None:
+        async with _http_client() as client:
+            return await afind_sales_categories(company_name, client)
+
+    website_result = await afind_company_website(company_name)
+    if not website_result.website:
+        return _empty_result(company_name, website_result)
+
+    raw_categories = await aextract_categories(client, str(website_result.website))
+    categories = await _arefine_categories(company_name, raw_categories)
 
     return {
         "company": company_name,
@@ -186,6 +331,22 @@ def find_sales_categories(company_name: str) -> dict:
     }
 
 
+async def afind_sales_categories_batch(companies: list[str], concurrency: int = 4) -> list[dict]:
+    """Process several companies concurrently, at most `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with _http_client() as client:
+
+        async def process(company: str) -> dict:
+            async with semaphore:
+                print(f"\n🔍 Processing: {company}")
+                result = await afind_sales_categories(company, client)
+                print(f"\n✅ Result for {company}: {result}\n")
+                return result
+
+        return await asyncio.gather(*(process(company) for company in companies))
+
+
 # ======================================================
 # 5. CLI Entry Point (Single or Batch)
 # ======================================================
@@ -203,12 +364,7 @@ if __name__ == "__main__":
     else:
         parser.error("Please provide either --company or --companies")
 
-    results = []
-    for company in companies:
-        print(f"\n🔍 Processing: {company}")
-        result = find_sales_categories(company)
-        results.append(result)
-        print(f"\n✅ Result for {company}: {result}\n")
+    results = asyncio.run(afind_sales_categories_batch(companies))
 
     if len(results) > 1:
         os.makedirs("outputs", exist_ok=True)